@@ -1,11 +1,22 @@
+import atexit
 import os
 import json
+import re
+import shutil
+import threading
+import time
+import zlib
 from flask import (
-    Flask, request, redirect, url_for, render_template_string,
-    send_from_directory, abort, session, flash
+    Flask, request, redirect, url_for,
+    send_from_directory, abort, session, flash, Response,
+    stream_with_context, get_flashed_messages
 )
+from jinja2 import DictLoader
 from werkzeug.utils import secure_filename
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
+from typing import Iterator, Optional
 
 app = Flask(__name__)
 app.secret_key = 'replace_with_a_very_secret_key'  # Change in prod
@@ -15,37 +26,120 @@ BASE_DATA_DIR = 'wiki_pages'  # base parent directory containing user spaces
 IMG_DIR = 'wiki_images'
 USERS_FILE = 'users.json'  # store registered users here, super user not stored here
 
+# Behind a server that honours X-Sendfile (Apache mod_xsendfile, lighttpd), set True so it sends image bytes
+# instead of a Python worker. nginx ignores X-Sendfile (it uses X-Accel-Redirect), so leave this off there.
+USE_X_SENDFILE = False
+app.config['USE_X_SENDFILE'] = USE_X_SENDFILE
+
+# App-wide request body cap, mainly for page saves and image uploads: Werkzeug answers 413
+# before buffering anything larger than 16 MiB
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
+# Tighter cap for the user management form, which only ever carries an action and a username
+MAX_ADMIN_FORM_BYTES = 4096
+
 ALLOWED_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
 SUPER_USER = 'Postman'  # globally hidden super user
 
+# Page names may not contain whitespace or path separators
+BAD_PAGE_NAME_RE = re.compile(r'[\s/\\]')
+
+# Usernames double as directory names: letters, digits, '_', '.', '-', not starting with '.'
+USERNAME_RE = re.compile(r'[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}')
+
 # Create necessary dirs if missing
 os.makedirs(BASE_DATA_DIR, exist_ok=True)
 os.makedirs(IMG_DIR, exist_ok=True)
 
+# Static CSS/JS are cached for a year; their URLs carry the files' mtime so edits still reach browsers
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000
+app.jinja_env.globals['static_version'] = int(max(
+    os.path.getmtime(os.path.join(app.static_folder, name)) for name in ('app.css', 'app.js')
+))
+
 # Load users.json or create default
 def load_users():
     if not os.path.exists(USERS_FILE):
-        with open(USERS_FILE, 'w') as f:
-            json.dump([], f)
+        save_users([])
         return []
-    with open(USERS_FILE, 'r') as f:
+    with open(USERS_FILE, 'rb') as f:
         try:
-            users = json.load(f)
+            users = json.loads(f.read())
             if not isinstance(users, list):
                 return []
             return users
         except:
             return []
+# Write to a temp file and swap it in so a crash mid-write never leaves a truncated users.json.
+# No fsync per save; the atomic rename is enough here and buffers are flushed to disk at exit.
 def save_users(users):
-    with open(USERS_FILE, 'w') as f:
-        json.dump(users, f, indent=2)
-users_list = load_users()
+    data = memoryview(json.dumps(sorted(users), separators=(',', ':')).encode())
+    tmp_path = USERS_FILE + '.tmp'
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, USERS_FILE)
+if hasattr(os, 'sync'):
+    atexit.register(os.sync)
+users_list = set(load_users())
+
+# Bumped whenever the page chrome (page lists, user list) changes; feeds page ETags.
+# Seeded from the clock so ETags from a previous process are never reused.
+chrome_version = time.time_ns()
+def bump_chrome_version():
+    global chrome_version
+    chrome_version += 1
+
+# Guards users_list mutations and iteration; re-entrant so helpers can be called while it is held
+users_lock = threading.RLock()
+
+# Sorted user tuples for templates, built together on first use after users_list changes:
+# (super-user-first tuple of all users, tuple of registered users only)
+_user_tuples_cache = None
+def _user_tuples():
+    global _user_tuples_cache
+    user_tuples = _user_tuples_cache
+    if user_tuples is None:
+        with users_lock:
+            registered = tuple(sorted(users_list))
+            user_tuples = _user_tuples_cache = ((SUPER_USER, *registered), registered)
+    return user_tuples
+
+def get_all_users():
+    return _user_tuples()[0]
+
+def get_registered_users():
+    return _user_tuples()[1]
+
+# Set for space checks and cached user tuples; refresh whenever users_list changes
+def refresh_user_index():
+    global _user_tuples_cache, valid_spaces
+    _user_tuples_cache = None
+    valid_spaces = frozenset(users_list) | {SUPER_USER}
+    bump_chrome_version()
+refresh_user_index()
+
+# User directory paths, joined once per user
+_user_dir_cache = {}
+def user_dir_path(username: str) -> str:
+    user_dir = _user_dir_cache.get(username)
+    if user_dir is None:
+        user_dir = _user_dir_cache[username] = os.path.join(BASE_DATA_DIR, username)
+    return user_dir
+
+# User spaces known to exist on disk, so the hot path skips the stat
+_ensured = set()
 
 # Helper to create user space dir if missing
-def ensure_user_space(username):
-    user_dir = os.path.join(BASE_DATA_DIR, username)
+def ensure_user_space(username: str) -> str:
+    user_dir = user_dir_path(username)
+    if username in _ensured:
+        return user_dir
     if not os.path.exists(user_dir):
         os.makedirs(user_dir)
+    _ensured.add(username)
     return user_dir
 
 # Ensure spaces for all users on load
@@ -53,6 +147,51 @@ for user in users_list:
     ensure_user_space(user)
 ensure_user_space(SUPER_USER)  # super user space exists too
 
+# Walk a tree breadth-first with os.scandir, yielding file paths as they are found and
+# recording directories per level in dirs (dirs[0] is the root)
+def _iter_tree_files(path, dirs):
+    dirs.append([path])
+    queue = deque([(path, 0)])
+    while queue:
+        current, level = queue.popleft()
+        with os.scandir(current) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if len(dirs) == level + 1:
+                        dirs.append([])
+                    dirs[level + 1].append(entry.path)
+                    queue.append((entry.path, level + 1))
+                else:
+                    yield entry.path
+
+# Delete a directory tree: files are handed to a thread pool for unlinking while the walk is
+# still running, then directories are removed level by level, deepest first
+def parallel_rmtree(path, workers=min(32, (os.cpu_count() or 1) * 4)):
+    dirs = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in pool.map(os.unlink, _iter_tree_files(path, dirs)):
+            pass
+        for level_dirs in reversed(dirs):
+            for _ in pool.map(os.rmdir, level_dirs):
+                pass
+
+# Background worker for slow housekeeping that should not hold up a request
+background_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='wiki-background')
+
+def _log_background_failure(future):
+    exc = future.exception()
+    if exc is not None:
+        app.logger.error('Background task failed: %s', exc)
+
+# Removed user spaces are renamed to this prefix, then deleted in the background
+REMOVED_SPACE_PREFIX = '.removed-'
+
+# Finish deleting spaces of removed users left behind by a previous run
+with os.scandir(BASE_DATA_DIR) as it:
+    for entry in it:
+        if entry.name.startswith(REMOVED_SPACE_PREFIX) and entry.is_dir(follow_symlinks=False):
+            background_executor.submit(parallel_rmtree, entry.path).add_done_callback(_log_background_failure)
+
 # Access control decorators
 def login_required(f):
     @wraps(f)
@@ -69,52 +208,181 @@ def user_can_edit(username, target_user):
         return True
     return username == target_user
 
-def allowed_image(filename):
+def valid_username(username: str) -> bool:
+    return USERNAME_RE.fullmatch(username) is not None
+
+def allowed_image(filename: str) -> bool:
     return '.' in filename and filename.rsplit('.',1)[1].lower() in ALLOWED_IMAGE_EXTENSIONS
 
+# In-memory index of page names per user space, filled lazily and kept current by save/delete.
+# Each entry is (names, lowercased names) for search; entries are replaced rather than mutated
+# so readers never see a half-updated index.
+_pages_cache = {}
+_pages_cache_lock = threading.Lock()
+
+def _build_page_index(pages):
+    pages = sorted(pages, key=str.lower)
+    return pages, [p.lower() for p in pages]
+
+def _page_index(user):
+    index = _pages_cache.get(user)
+    if index is not None:
+        return index
+    with _pages_cache_lock:
+        index = _pages_cache.get(user)
+        if index is None:
+            user_dir = ensure_user_space(user)
+            with os.scandir(user_dir) as it:
+                index = _build_page_index(e.name[:-5] for e in it if e.name.endswith('.html') and e.is_file())
+            _pages_cache[user] = index
+    return index
+
 # Helper: list pages in given user space
-def list_pages(user):
-    user_dir = ensure_user_space(user)
-    files = [f for f in os.listdir(user_dir) if f.endswith('.html')]
-    return sorted([os.path.splitext(f)[0] for f in files], key=str.lower)
+def list_pages(user: str) -> list[str]:
+    return _page_index(user)[0]
+
+# Helper: pages in given user space whose name contains query, ignoring case
+def search_pages(user: str, query: str) -> list[str]:
+    names, lowers = _page_index(user)
+    query = query.lower()
+    return [name for name, lower in zip(names, lowers) if query in lower]
+
+# Keep the page index in step with page writes and user removal
+def _index_page(user, page_name):
+    with _pages_cache_lock:
+        index = _pages_cache.get(user)
+        if index is not None and page_name not in index[0]:
+            _pages_cache[user] = _build_page_index(index[0] + [page_name])
+            bump_chrome_version()
+
+def _unindex_page(user, page_name):
+    with _pages_cache_lock:
+        index = _pages_cache.get(user)
+        if index is not None and page_name in index[0]:
+            _pages_cache[user] = _build_page_index(p for p in index[0] if p != page_name)
+            bump_chrome_version()
+
+def _forget_pages(user):
+    with _pages_cache_lock:
+        _pages_cache.pop(user, None)
+        bump_chrome_version()
+
+# Path of a page file in a user space (created if missing)
+def page_path(username: str, page_name: str) -> str:
+    return f"{ensure_user_space(username)}/{page_name}.html"
 
 # Load page content per user space
-def load_page(username, page_name):
-    user_dir = ensure_user_space(username)
-    path = os.path.join(user_dir, f"{page_name}.html")
-    if os.path.exists(path):
+def load_page(username: str, page_name: str) -> Optional[str]:
+    path = page_path(username, page_name)
+    try:
         with open(path, 'r', encoding='utf-8') as f:
             return f.read()
-    else:
+    except FileNotFoundError:
         return None
 
+# Small pages are kept in memory per (space, page) and revalidated against the file's mtime and size.
+# Least recently viewed pages are evicted once the cached pages exceed PAGE_CACHE_TOTAL_BYTES.
+PAGE_CACHE_MAX_BYTES = 65536
+PAGE_CACHE_TOTAL_BYTES = 8 * 1024 * 1024
+_page_content_cache = OrderedDict()  # (space, page) -> ((mtime_ns, size), content)
+_page_content_cache_bytes = 0
+_page_content_cache_lock = threading.Lock()
+
+def _get_cached_page(key, version):
+    with _page_content_cache_lock:
+        cached = _page_content_cache.get(key)
+        if cached is None or cached[0] != version:
+            return None
+        _page_content_cache.move_to_end(key)
+        return cached[1]
+
+def _cache_page(key, version, content):
+    global _page_content_cache_bytes
+    with _page_content_cache_lock:
+        old = _page_content_cache.pop(key, None)
+        if old is not None:
+            _page_content_cache_bytes -= old[0][1]
+        _page_content_cache[key] = (version, content)
+        _page_content_cache_bytes += version[1]
+        while _page_content_cache_bytes > PAGE_CACHE_TOTAL_BYTES:
+            _, (evicted_version, _) = _page_content_cache.popitem(last=False)
+            _page_content_cache_bytes -= evicted_version[1]
+
+def _uncache_pages(keys):
+    global _page_content_cache_bytes
+    with _page_content_cache_lock:
+        for key in keys:
+            old = _page_content_cache.pop(key, None)
+            if old is not None:
+                _page_content_cache_bytes -= old[0][1]
+
+# Drop every cached page of a user space, e.g. when the user is removed
+def _uncache_user_pages(username):
+    with _page_content_cache_lock:
+        keys = [key for key in _page_content_cache if key[0] == username]
+    _uncache_pages(keys)
+
+# Stat a page file per user space; returns None if the page does not exist
+def stat_page(username: str, page_name: str) -> Optional[os.stat_result]:
+    path = page_path(username, page_name)
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+# Stream page content per user space in chunks; st is the page's stat_page() result
+def iter_page_chunks(username: str, page_name: str, st: os.stat_result, bufsize: int = 65536) -> Iterator[str]:
+    path = page_path(username, page_name)
+    key = (username, page_name)
+    version = (st.st_mtime_ns, st.st_size)
+    content = _get_cached_page(key, version)
+    if content is not None:
+        return iter((content,))
+    if st.st_size <= PAGE_CACHE_MAX_BYTES:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        _cache_page(key, version, content)
+        return iter((content,))
+    f = open(path, 'r', encoding='utf-8')
+    def chunks():
+        with f:
+            while True:
+                chunk = f.read(bufsize)
+                if not chunk:
+                    break
+                yield chunk
+    return chunks()
+
 # Save page content per user space
-def save_page(username, page_name, content):
-    user_dir = ensure_user_space(username)
-    path = os.path.join(user_dir, f"{page_name}.html")
+def save_page(username: str, page_name: str, content: str) -> None:
+    path = page_path(username, page_name)
     with open(path, 'w', encoding='utf-8') as f:
         f.write(content)
+    _uncache_pages([(username, page_name)])
+    _index_page(username, page_name)
 
 # Delete page
-def delete_page(username, page_name):
-    user_dir = ensure_user_space(username)
-    path = os.path.join(user_dir, f"{page_name}.html")
-    if os.path.exists(path):
+def delete_page(username: str, page_name: str) -> bool:
+    path = page_path(username, page_name)
+    try:
         os.remove(path)
-        return True
-    return False
+    except FileNotFoundError:
+        return False
+    _uncache_pages([(username, page_name)])
+    _unindex_page(username, page_name)
+    return True
 
 # Context processor inject common variables
 @app.context_processor
-def inject_user_and_pages():
+def inject_user_and_pages() -> dict:
     current_user = session.get('username')
     # For super user, current_space can be selected via query param 'space' or defaults to super user own space
     if current_user == SUPER_USER:
         current_space = request.args.get('space', SUPER_USER)
         # Validate current_space
-        if current_space != SUPER_USER and current_space not in users_list:
+        if current_space not in valid_spaces:
             current_space = SUPER_USER
-        user_list_for_select = [SUPER_USER] + users_list
+        user_list_for_select = get_all_users()
     elif current_user:
         current_space = current_user
         user_list_for_select = [current_user]
@@ -139,7 +407,8 @@ def inject_user_and_pages():
         current_space=current_space,
         pages=pages,
         all_users=user_list_for_select,
-        super_user=SUPER_USER
+        super_user=SUPER_USER,
+        is_admin=current_user == SUPER_USER
     )
 
 # Templates with sidebar/ navbar and auth
@@ -155,240 +424,7 @@ BASE_HTML = '''
 <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet" crossorigin="anonymous"/>
 <!-- Bootstrap Icons -->
 <link href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.5/font/bootstrap-icons.css" rel="stylesheet" />
-<style>
-  :root {
-    --primary-color: #0052cc;
-    --secondary-color: #172b4d;
-    --bg-color: #f4f5f7;
-    --content-bg: #ffffff;
-    --text-color: #172b4d;
-    --link-color: #0052cc;
-    --border-color: #dfe1e6;
-  }
-  body {
-    padding-top: 56px;
-    font-family: "Segoe UI", Tahoma, Geneva, Verdana, sans-serif;
-    background-color: var(--bg-color);
-    color: var(--text-color);
-    transition: padding-top 0.3s ease;
-  }
-  .navbar {
-    background-color: var(--primary-color) !important;
-    box-shadow: 0 2px 4px rgb(0 0 0 / 0.1);
-    transition: top 0.3s ease, height 0.3s ease, padding 0.3s ease;
-  }
-  .navbar.minimized {
-    height: 2.5rem !important;
-    padding-top: 0 !important;
-    padding-bottom: 0 !important;
-    overflow: hidden;
-  }
-  .navbar-brand {
-    font-weight: 700;
-    font-size: 1.5rem;
-    color: white !important;
-    transition: opacity 0.3s ease;
-  }
-  .navbar.minimized .navbar-brand {
-    opacity: 0;
-    pointer-events: none;
-  }
-  .navbar-brand:hover {
-    color: #c2d4ff !important;
-    text-decoration: none;
-  }
-  a, a:hover {
-    color: var(--link-color);
-    text-decoration: none;
-  }
-  .container-fluid {
-    padding-left: 0;
-    padding-right: 0;
-    max-width: 100vw;
-  }
-  .content-area {
-    padding: 2rem;
-    background: var(--content-bg);
-    border-radius: 6px;
-    box-shadow: 0 1px 3px rgb(9 30 66 / 0.25);
-    border: 1px solid var(--border-color);
-    margin-bottom: 3rem;
-    min-height: 80vh;
-    overflow-wrap: break-word;
-  }
-  h1 {
-    font-weight: 600;
-    margin-bottom: 1rem;
-    color: var(--secondary-color);
-  }
-  .btn-primary {
-    background-color: var(--primary-color);
-    border-color: var(--primary-color);
-  }
-  .btn-primary:hover {
-    background-color: #003d99;
-    border-color: #003d99;
-  }
-  .btn-secondary {
-    border-radius: 6px;
-  }
-  .btn-outline-primary {
-    color: var(--primary-color);
-    border-color: var(--primary-color);
-  }
-  .btn-outline-primary:hover {
-    background-color: var(--primary-color);
-    color: white;
-  }
-  .btn-outline-danger {
-    color: #de350b;
-    border-color: #de350b;
-  }
-  .btn-outline-danger:hover {
-    background-color: #de350b;
-    color: white;
-  }
-  textarea {
-    font-family: monospace;
-    border: 1px solid var(--border-color);
-    border-radius: 6px;
-  }
-  .search-bar .input-group-text {
-    background-color: white;
-    border: 1px solid var(--border-color);
-    border-right: none;
-  }
-  .search-bar input.form-control {
-    border-radius: 6px 0 0 6px;
-    border-right: none;
-  }
-  .search-bar button {
-    border-radius: 0 6px 6px 0;
-  }
-  .breadcrumb {
-    background: none;
-    padding-left: 0;
-    margin-bottom: 1rem;
-  }
-  .breadcrumb-item + .breadcrumb-item::before {
-    content: ">";
-  }
-  .content img {
-    max-width: 100%;
-    border-radius: 4px;
-    box-shadow: 0 1px 3px rgb(9 30 66 / 0.15);
-  }
-  .alert {
-    border-radius: 6px;
-  }
-  /* Sidebar */
-  #sidebar {
-    position: fixed;
-    top: 56px;
-    left: 0;
-    height: calc(100vh - 56px);
-    width: 280px;
-    background: white;
-    border-right: 1px solid var(--border-color);
-    overflow-y: auto;
-    padding: 1rem;
-    z-index: 1030;
-    transition: top 0.3s ease;
-  }
-  #sidebar.minimized {
-    top: 2.5rem;
-    height: calc(100vh - 2.5rem);
-  }
-  #sidebar h5 {
-    font-weight: 600;
-    margin-bottom: 1rem;
-    color: var(--secondary-color);
-  }
-  #sidebar ul {
-    list-style: none;
-    padding-left: 0;
-  }
-  #sidebar ul li {
-    margin-bottom: 0.5rem;
-  }
-  #sidebar ul li a {
-    color: var(--primary-color);
-    text-decoration: none;
-    display: block;
-    padding: 0.4rem 0.6rem;
-    border-radius: 4px;
-  }
-  #sidebar ul li a.active,
-  #sidebar ul li a:hover {
-    background-color: var(--primary-color);
-    color: white;
-    text-decoration: none;
-  }
-  /* Main content next to sidebar */
-  #main-content {
-    margin-left: 290px;
-    padding: 2rem 2.5rem 3rem 2.5rem;
-    max-width: 960px;
-    background: var(--content-bg);
-    border-radius: 6px;
-    box-shadow: 0 1px 3px rgb(9 30 66 / 0.25);
-    min-height: 80vh;
-    overflow-wrap: break-word;
-    transition: margin-top 0.3s ease;
-  }
-  #main-content.minimized {
-    margin-top: 2.5rem; /* adjusted for minimized navbar */
-  }
-  /* Navbar right */
-  .navbar-nav.ml-auto {
-    margin-left: auto;
-  }
-  /* User space selector dropdown for super user */
-  #spaceSelectForm select {
-    border-radius: 6px;
-    border: 1px solid var(--border-color);
-    padding: 0.25rem 0.5rem;
-    min-width: 140px;
-  }
-  /* Collapsible section toggle button */
-  .section-header {
-    display: flex;
-    align-items: center;
-    cursor: pointer;
-    user-select: none;
-  }
-  .toggle-btn {
-    margin-left: auto;
-    background-color: var(--primary-color);
-    border: none;
-    color: white;
-    border-radius: 4px;
-    width: 28px;
-    height: 28px;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    font-size: 18px;
-    line-height: 1;
-  }
-  .toggle-btn:hover {
-    background-color: #003d99;
-  }
-  /* Navbar minimize button */
-  #navbarMinimizeBtn {
-    background-color: transparent;
-    border: none;
-    color: white;
-    font-size: 1.25rem;
-    display: flex;
-    align-items: center;
-    cursor: pointer;
-    margin-left: 0.75rem;
-  }
-  #navbarMinimizeBtn:hover {
-    color: #c2d4ff;
-  }
-</style>
+<link href="{{ url_for('static', filename='app.css', v=static_version) }}" rel="stylesheet" />
 </head>
 <body>
 <nav class="navbar fixed-top navbar-expand-lg">
@@ -438,7 +474,7 @@ BASE_HTML = '''
          class="{% if page == current_page %}active{% endif %}">{{ page }}</a>
     </li>
     {% endfor %}
-    {% if username and user_can_edit(username, current_space) %}
+    {% if username and (is_admin or username == current_space) %}
     <li><a href="{{ url_for('new_page', space=current_space) }}"><i class="bi bi-plus-circle"></i> New Page</a></li>
     {% endif %}
   </ul>
@@ -455,77 +491,14 @@ BASE_HTML = '''
       {% endfor %}
     {% endif %}
   {% endwith %}
-  {{ body|safe }}
+  {% block body %}{% endblock %}
 </div>
 
 <!-- Bootstrap JS Bundle -->
 <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js" crossorigin="anonymous"></script>
 
-<!-- Section toggle script -->
-<script>
-document.addEventListener('DOMContentLoaded', function() {
-    const contentDiv = document.querySelector('.content');
-    if (!contentDiv) return;
-
-    const headings = contentDiv.querySelectorAll('h2');
-    headings.forEach(heading => {
-        const toggleBtn = document.createElement('button');
-        toggleBtn.classList.add('toggle-btn');
-        toggleBtn.setAttribute('aria-label', 'Toggle section');
-        toggleBtn.innerHTML = '&#x2212;'; // minus sign, initially expanded
-
-        const wrapper = document.createElement('div');
-        wrapper.classList.add('section-header');
-        while (heading.firstChild) {
-          wrapper.appendChild(heading.firstChild);
-        }
-        heading.textContent = '';
-        heading.appendChild(wrapper);
-        wrapper.appendChild(toggleBtn);
-
-        let sectionContent = [];
-        let sibling = heading.nextElementSibling;
-        while (sibling && sibling.tagName.toLowerCase() !== 'h2') {
-            sectionContent.push(sibling);
-            sibling = sibling.nextElementSibling;
-        }
-
-        toggleBtn.addEventListener('click', () => {
-            const isCollapsed = toggleBtn.innerHTML === '+';
-            if (isCollapsed) {
-                toggleBtn.innerHTML = '&#x2212;';
-                sectionContent.forEach(el => el.style.display = '');
-            } else {
-                toggleBtn.innerHTML = '+';
-                sectionContent.forEach(el => el.style.display = 'none');
-            }
-        });
-    });
-
-    // Navbar minimize toggle
-    const nav = document.querySelector('nav.navbar');
-    const sidebar = document.getElementById('sidebar');
-    const mainContent = document.getElementById('main-content');
-    const btn = document.getElementById('navbarMinimizeBtn');
-    if (nav && sidebar && mainContent && btn) {
-        btn.addEventListener('click', () => {
-            const minimized = nav.classList.toggle('minimized');
-            sidebar.classList.toggle('minimized', minimized);
-            mainContent.classList.toggle('minimized', minimized);
-            // Change icon and aria-expanded attribute
-            if (minimized) {
-                btn.innerHTML = '<i class="bi bi-chevron-down"></i>';
-                btn.setAttribute('aria-expanded', 'false');
-                btn.setAttribute('title', 'Maximize navbar');
-            } else {
-                btn.innerHTML = '<i class="bi bi-chevron-up"></i>';
-                btn.setAttribute('aria-expanded', 'true');
-                btn.setAttribute('title', 'Minimize navbar');
-            }
-        });
-    }
-});
-</script>
+<!-- Section toggle and navbar minimize script -->
+<script src="{{ url_for('static', filename='app.js', v=static_version) }}" defer></script>
 
 </body>
 </html>
@@ -539,7 +512,7 @@ document.addEventListener('DOMContentLoaded', function() {
 # Just the BASE_HTML and inline script stylistic and functional updates included.
 
 
-INDEX_BODY = '''
+INDEX_BODY = '''{% extends 'base.html' %}{% block body %}
 <div class="d-flex justify-content-between align-items-center mb-3">
   <h1>Pages</h1>
 </div>
@@ -553,17 +526,17 @@ INDEX_BODY = '''
     {% endif %}
   </div>
 </form>
-{% if pages %}
+{% if results %}
 <ul class="list-group list-group-flush">
-  {% for page in pages %}
+  {% for page, view_url, edit_url, delete_url in results %}
   <li class="list-group-item d-flex justify-content-between align-items-center">
-    <a href="{{ url_for('view_page', page_name=page, space=current_space) }}" class="fw-semibold">{{ page }}</a>
+    <a href="{{ view_url }}" class="fw-semibold">{{ page }}</a>
     <span>
-      {% if username and user_can_edit(username, current_space) %}
-      <a href="{{ url_for('edit_page', page_name=page, space=current_space) }}" class="btn btn-sm btn-outline-primary me-2" title="Edit">
+      {% if can_edit %}
+      <a href="{{ edit_url }}" class="btn btn-sm btn-outline-primary me-2" title="Edit">
         <i class="bi bi-pencil"></i>
       </a>
-      <form action="{{ url_for('delete_page_route', page_name=page, space=current_space) }}" method="POST" style="display:inline;" onsubmit="return confirm('Delete page {{page}}?');">
+      <form action="{{ delete_url }}" method="POST" style="display:inline;" onsubmit="return confirm('Delete page {{page}}?');">
         <button type="submit" class="btn btn-sm btn-outline-danger" title="Delete">
           <i class="bi bi-trash"></i>
         </button>
@@ -576,9 +549,9 @@ INDEX_BODY = '''
 {% else %}
 <p class="text-muted fs-5">No pages found.</p>
 {% endif %}
-'''
+{% endblock %}'''
 
-VIEW_PAGE_BODY = '''
+VIEW_PAGE_BODY = '''{% extends 'base.html' %}{% block body %}
 <nav aria-label="breadcrumb">
   <ol class="breadcrumb">
     <li class="breadcrumb-item"><a href="{{ url_for('index', space=current_space) }}">Home</a></li>
@@ -588,10 +561,10 @@ VIEW_PAGE_BODY = '''
 <div class="content-area">
   <h1 class="mb-4">{{ page_name }}</h1>
   <div class="content">
-    {{ content | safe }}
+    {% for chunk in content %}{{ chunk | safe }}{% endfor %}
   </div>
 </div>
-{% if username and user_can_edit(username, current_space) %}
+{% if username and (is_admin or username == current_space) %}
 <a href="{{ url_for('edit_page', page_name=page_name, space=current_space) }}" class="btn btn-primary me-2">
   <i class="bi bi-pencil-square"></i> Edit Page
 </a>
@@ -599,9 +572,9 @@ VIEW_PAGE_BODY = '''
 <a href="{{ url_for('index', space=current_space) }}" class="btn btn-secondary">
   <i class="bi bi-house-door"></i> Back to Index
 </a>
-'''
+{% endblock %}'''
 
-EDIT_PAGE_BODY = '''
+EDIT_PAGE_BODY = '''{% extends 'base.html' %}{% block body %}
 <h1 class="mb-4">Edit Page: {{ page_name }}</h1>
 <form method="POST" enctype="multipart/form-data" class="mb-3">
   <div class="mb-4">
@@ -626,9 +599,9 @@ EDIT_PAGE_BODY = '''
 {% endif %}
 <p class="mt-3">To include an uploaded image in your content, use this format:</p>
 <pre>&lt;img src="/images/your_image_filename.ext"&gt;</pre>
-'''
+{% endblock %}'''
 
-NEW_PAGE_BODY = '''
+NEW_PAGE_BODY = '''{% extends 'base.html' %}{% block body %}
 <h1 class="mb-4">Create New Page</h1>
 <form method="POST" class="mb-3">
   <input type="hidden" name="space" value="{{ current_space }}">
@@ -648,9 +621,9 @@ NEW_PAGE_BODY = '''
     {{ messages }}
   </div>
 {% endif %}
-'''
+{% endblock %}'''
 
-LOGIN_BODY = '''
+LOGIN_BODY = '''{% extends 'base.html' %}{% block body %}
 <h1 class="mb-4">Login</h1>
 <form method="POST" class="mb-3" novalidate>
   <div class="mb-3">
@@ -667,7 +640,87 @@ LOGIN_BODY = '''
     {{ messages }}
   </div>
 {% endif %}
-'''
+{% endblock %}'''
+
+ADMIN_USERS_BODY = '''{% extends 'base.html' %}{% block body %}
+<h1 class="mb-4">User Management</h1>
+<form method="POST" class="mb-4">
+  <div class="input-group mb-3">
+    <input type="text" name="username" class="form-control" placeholder="Username" autofocus>
+    <button class="btn btn-success" name="action" value="add" type="submit">
+      <i class="bi bi-plus-circle"></i> Add User
+    </button>
+  </div>
+  {% if messages %}
+    <div class="alert alert-danger" role="alert">
+      {{ messages }}
+    </div>
+  {% endif %}
+</form>
+
+<h3>Existing Users</h3>
+{% if users_show %}
+<ul class="list-group">
+  {% for user in users_show %}
+  <li class="list-group-item d-flex justify-content-between align-items-center">
+    {{ user }}
+    <form method="POST" style="margin:0;">
+      <input type="hidden" name="username" value="{{ user }}">
+      <button type="submit" class="btn btn-danger btn-sm" name="action" value="remove" onclick="return confirm('Remove user {{ user }}? This will also remove their pages!');">
+        <i class="bi bi-trash"></i> Remove
+      </button>
+    </form>
+  </li>
+  {% endfor %}
+</ul>
+{% else %}
+<p>No users found.</p>
+{% endif %}
+<a href="{{ url_for('index', space=super_user) }}" class="btn btn-secondary mt-3">
+  <i class="bi bi-arrow-left"></i> Back to Wiki
+</a>
+{% endblock %}'''
+
+# Templates are fixed at import: skip per-render reload checks and drop whitespace around block tags
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+app.jinja_env.auto_reload = False
+app.jinja_env.trim_blocks = True
+app.jinja_env.lstrip_blocks = True
+
+# Strip indentation and blank lines from a template source; none of the templates rely on them
+def _minify(source):
+    return '\n'.join(line.strip() for line in source.splitlines() if line.strip())
+
+# Page bodies extend BASE_HTML, so each view compiles and renders as one template
+app.jinja_loader = DictLoader({name: _minify(source) for name, source in {
+    'base.html': BASE_HTML,
+    'index.html': INDEX_BODY,
+    'view_page.html': VIEW_PAGE_BODY,
+    'edit_page.html': EDIT_PAGE_BODY,
+    'new_page.html': NEW_PAGE_BODY,
+    'login.html': LOGIN_BODY,
+    'admin_users.html': ADMIN_USERS_BODY,
+}.items()})
+_INDEX_TMPL = app.jinja_env.get_template('index.html')
+_VIEW_PAGE_TMPL = app.jinja_env.get_template('view_page.html')
+_EDIT_PAGE_TMPL = app.jinja_env.get_template('edit_page.html')
+_NEW_PAGE_TMPL = app.jinja_env.get_template('new_page.html')
+_LOGIN_TMPL = app.jinja_env.get_template('login.html')
+_ADMIN_USERS_TMPL = app.jinja_env.get_template('admin_users.html')
+
+# Render a precompiled template with the same context injection as Flask's render_template
+def render(template, **context):
+    app.update_template_context(context)
+    return template.render(context)
+
+# Stream a precompiled template so large pages go out as they are read instead of being built in memory
+def render_stream(template, **context):
+    app.update_template_context(context)
+    # Pop flashes now: the session cookie is written before the streamed body is generated
+    get_flashed_messages(with_categories=True)
+    stream = template.stream(context)
+    stream.enable_buffering(16)
+    return Response(stream_with_context(stream), mimetype='text/html')
 
 # Routes
 
@@ -678,7 +731,7 @@ def index():
     # Super user can select space by query parameter
     space = request.args.get('space')
     if current_user == SUPER_USER:
-        if space not in [SUPER_USER] + users_list:
+        if space not in valid_spaces:
             space = SUPER_USER
     else:
         # Visitors and normal users default to super user space if not logged in or no other space
@@ -688,22 +741,26 @@ def index():
             space = current_user
 
     query = request.args.get('q', '').strip()
-    pages = list_pages(space)
-    if query:
-        pages = [p for p in pages if query.lower() in p.lower()]
+    pages = search_pages(space, query) if query else list_pages(space)
+
+    # Build row links here once per page instead of calling url_for from inside the template loop
+    can_edit = user_can_edit(current_user, space)
+    results = [(p, url_for('view_page', page_name=p, space=space),
+                url_for('edit_page', page_name=p, space=space) if can_edit else None,
+                url_for('delete_page_route', page_name=p, space=space) if can_edit else None)
+               for p in pages]
 
-    body = render_template_string(INDEX_BODY, pages=pages, query=query, current_space=space, username=current_user, user_can_edit=user_can_edit)
-    return render_template_string(BASE_HTML, title="Home - Personal Wiki", body=body, current_space=space,
-                                  username=current_user,
-                                  display_username='Super User' if current_user==SUPER_USER else current_user,
-                                  all_users=[SUPER_USER]+users_list, super_user=SUPER_USER)
+    return render(_INDEX_TMPL, title="Home - Personal Wiki", results=results, query=query, current_space=space,
+                  username=current_user, can_edit=can_edit,
+                  display_username='Super User' if current_user==SUPER_USER else current_user,
+                  all_users=get_all_users(), super_user=SUPER_USER)
 
 @app.route('/page/<page_name>')
 def view_page(page_name):
     current_user = session.get('username')
     space = request.args.get('space')
     if current_user == SUPER_USER:
-        if space not in [SUPER_USER] + users_list:
+        if space not in valid_spaces:
             space = SUPER_USER
     else:
         if not current_user:
@@ -711,16 +768,27 @@ def view_page(page_name):
         else:
             space = current_user
 
-    content = load_page(space, page_name)
-    if content is None:
+    st = stat_page(space, page_name)
+    if st is None:
         abort(404)
 
-    body = render_template_string(VIEW_PAGE_BODY, page_name=page_name, content=content, current_space=space,
-                                  username=current_user, user_can_edit=user_can_edit)
-    return render_template_string(BASE_HTML, title=page_name, body=body, current_space=space,
-                                  username=current_user,
-                                  display_username='Super User' if current_user==SUPER_USER else current_user,
-                                  all_users=[SUPER_USER]+users_list, super_user=SUPER_USER)
+    # The rendered page also shows the viewer and sidebar, so those feed the ETag. A render that
+    # includes one-off flash messages gets no ETag, so a later visit can never revalidate to it.
+    etag = f'{st.st_mtime_ns:x}-{st.st_size:x}-{chrome_version:x}-{zlib.crc32((current_user or "").encode()):x}'
+    has_flashes = '_flashes' in session
+    if not has_flashes and request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        content = iter_page_chunks(space, page_name, st)
+        response = render_stream(_VIEW_PAGE_TMPL, title=page_name, page_name=page_name, content=content, current_space=space,
+                                 username=current_user,
+                                 display_username='Super User' if current_user==SUPER_USER else current_user,
+                                 all_users=get_all_users(), super_user=SUPER_USER)
+    if not has_flashes:
+        response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
 
 @app.route('/edit/<page_name>', methods=['GET','POST'])
 @login_required
@@ -728,7 +796,7 @@ def edit_page(page_name):
     current_user = session.get('username')
     space = request.args.get('space')
     if current_user == SUPER_USER:
-        if space not in [SUPER_USER] + users_list:
+        if space not in valid_spaces:
             space = SUPER_USER
     else:
         if not current_user:
@@ -749,7 +817,9 @@ def edit_page(page_name):
             img = request.files['image']
             if img and img.filename != '' and allowed_image(img.filename):
                 filename = secure_filename(img.filename)
-                img.save(os.path.join(IMG_DIR, filename))
+                # Copy in 1 MiB blocks rather than FileStorage.save's 16 KiB default
+                with open(os.path.join(IMG_DIR, filename), 'wb') as out:
+                    shutil.copyfileobj(img.stream, out, 1 << 20)
                 messages = f'Image "{filename}" uploaded successfully. Add it in content as &lt;img src="/images/{filename}"&gt;.'
             elif img and img.filename != '':
                 messages = 'File type not allowed for image upload.'
@@ -759,11 +829,10 @@ def edit_page(page_name):
     else:
         content = load_page(space, page_name) or ''
 
-    body = render_template_string(EDIT_PAGE_BODY, page_name=page_name, content=content, messages=messages, current_space=space)
-    return render_template_string(BASE_HTML, title=f"Edit {page_name}", body=body,
-                                  current_space=space, username=current_user,
-                                  display_username='Super User' if current_user==SUPER_USER else current_user,
-                                  all_users=[SUPER_USER]+users_list, super_user=SUPER_USER)
+    return render(_EDIT_PAGE_TMPL, title=f"Edit {page_name}", page_name=page_name, content=content, messages=messages,
+                  current_space=space, username=current_user,
+                  display_username='Super User' if current_user==SUPER_USER else current_user,
+                  all_users=get_all_users(), super_user=SUPER_USER)
 
 @app.route('/new', methods=['GET','POST'])
 @login_required
@@ -771,7 +840,7 @@ def new_page():
     current_user = session.get('username')
     space = request.args.get('space')
     if current_user == SUPER_USER:
-        if space not in [SUPER_USER] + users_list:
+        if space not in valid_spaces:
             space = SUPER_USER
     else:
         if not current_user:
@@ -787,7 +856,7 @@ def new_page():
     messages = ''
     if request.method == 'POST':
         page_name = request.form.get('page_name', '').strip()
-        if not page_name or any(c in page_name for c in ' /\\'):
+        if not page_name or BAD_PAGE_NAME_RE.search(page_name):
             messages = 'Page name cannot be empty or contain spaces or slashes.'
         elif page_name in list_pages(space):
             messages = 'Page already exists. Choose a different name.'
@@ -795,11 +864,10 @@ def new_page():
             save_page(space, page_name, '<p>Your content here</p>')
             flash(f'Page "{page_name}" created successfully.', 'success')
             return redirect(url_for('view_page', page_name=page_name, space=space))
-    body = render_template_string(NEW_PAGE_BODY, messages=messages, current_space=space)
-    return render_template_string(BASE_HTML, title="Create New Page", body=body, current_space=space,
-                                  username=current_user,
-                                  display_username='Super User' if current_user==SUPER_USER else current_user,
-                                  all_users=[SUPER_USER]+users_list, super_user=SUPER_USER)
+    return render(_NEW_PAGE_TMPL, title="Create New Page", messages=messages, current_space=space,
+                  username=current_user,
+                  display_username='Super User' if current_user==SUPER_USER else current_user,
+                  all_users=get_all_users(), super_user=SUPER_USER)
 
 @app.route('/delete/<page_name>', methods=['POST'])
 @login_required
@@ -807,7 +875,7 @@ def delete_page_route(page_name):
     current_user = session.get('username')
     space = request.args.get('space')
     if current_user == SUPER_USER:
-        if space not in [SUPER_USER] + users_list:
+        if space not in valid_spaces:
             space = SUPER_USER
     else:
         if not current_user:
@@ -829,10 +897,26 @@ def delete_page_route(page_name):
 
 @app.route('/images/<filename>')
 def images(filename):
-    return send_from_directory(IMG_DIR, filename)
+    # Uploads can overwrite an image of the same name, so revalidate by ETag rather than caching blindly
+    return send_from_directory(IMG_DIR, filename, conditional=True, max_age=0)
+
+# Rendered login page for logged-out visitors, reused until the page chrome changes
+_login_page_cache = (None, b'')
 
 @app.route('/login', methods=['GET','POST'])
 def login():
+    global _login_page_cache
+    if request.method == 'GET' and 'username' not in session and '_flashes' not in session:
+        version, page = _login_page_cache
+        if version != chrome_version:
+            version = chrome_version
+            page = render(_LOGIN_TMPL, title='Login', messages='',
+                          current_space=None, username=None,
+                          display_username=None, all_users=get_all_users(),
+                          super_user=SUPER_USER).encode()
+            _login_page_cache = (version, page)
+        return Response(page, mimetype='text/html')
+
     messages = ''
     if request.method == 'POST':
         username = request.form.get('username', '').strip()
@@ -845,11 +929,10 @@ def login():
             flash(f'Logged in as {"Super User" if username==SUPER_USER else username}', 'success')
             next_url = request.args.get('next') or url_for('index')
             return redirect(next_url)
-    body = render_template_string(LOGIN_BODY, messages=messages)
-    return render_template_string(BASE_HTML, title='Login', body=body,
-                                  current_space=None, username=None,
-                                  display_username=None, all_users=[SUPER_USER]+users_list,
-                                  super_user=SUPER_USER)
+    return render(_LOGIN_TMPL, title='Login', messages=messages,
+                  current_space=None, username=None,
+                  display_username=None, all_users=get_all_users(),
+                  super_user=SUPER_USER)
 
 @app.route('/logout')
 def logout():
@@ -857,6 +940,18 @@ def logout():
     flash('You have been logged out.', 'info')
     return redirect(url_for('index'))
 
+# Flash messages for user management
+MSG_USER_ADDED = 'User "%s" added.'
+MSG_USER_REMOVED = 'User "%s" removed; their pages are queued for deletion.'
+
+# The admin page URL has no parameters, so resolve it once (inside a request, to respect any script root)
+_manage_users_url = None
+def manage_users_redirect():
+    global _manage_users_url
+    if _manage_users_url is None:
+        _manage_users_url = url_for('manage_users')
+    return Response(status=303, headers={'Location': _manage_users_url})
+
 # Admin user management page: only super user allowed
 @app.route('/admin/users', methods=['GET','POST'])
 @login_required
@@ -867,92 +962,68 @@ def manage_users():
 
     messages = ''
     if request.method == 'POST':
-        action = request.form.get('action')
-        username = request.form.get('username', '').strip()
+        # Cap this request's body before anything parses it; this also bounds chunked bodies,
+        # which carry no Content-Length for the explicit check below to see
+        request.max_content_length = MAX_ADMIN_FORM_BYTES
+        if request.content_length and request.content_length > MAX_ADMIN_FORM_BYTES:
+            abort(413)
+        if request.content_length == 0:
+            # Empty body: nothing to parse
+            action, username = None, ''
+        else:
+            action = request.form.get('action')
+            username = request.form.get('username', '').strip()
         global users_list
-        if action == 'add':
-            if not username:
-                messages = 'Enter a username to add.'
-            elif username == SUPER_USER:
-                messages = 'Cannot add super user.'
-            elif username in users_list:
-                messages = 'User already exists.'
-            else:
-                users_list.append(username)
-                save_users(users_list)
-                ensure_user_space(username)
-                flash(f'User "{username}" added.', 'success')
-                return redirect(url_for('manage_users'))
-        elif action == 'remove':
-            if username in users_list:
-                # Delete user's space directory and contents recursively
-                user_space_path = os.path.join(BASE_DATA_DIR, username)
-                if os.path.exists(user_space_path) and os.path.isdir(user_space_path):
-                    import shutil
-                    shutil.rmtree(user_space_path)
-                users_list.remove(username)
-                save_users(users_list)
-                flash(f'User "{username}" removed.', 'success')
-                return redirect(url_for('manage_users'))
-            else:
-                messages = f'User "{username}" not found.'
-
-    # Show user list excluding super user
-    users_show = users_list[:]
-
-    ADMIN_USERS_BODY = '''
-    <h1 class="mb-4">User Management</h1>
-    <form method="POST" class="mb-4">
-      <div class="input-group mb-3">
-        <input type="text" name="username" class="form-control" placeholder="Username" autofocus>
-        <button class="btn btn-success" name="action" value="add" type="submit">
-          <i class="bi bi-plus-circle"></i> Add User
-        </button>
-      </div>
-      {% if messages %}
-        <div class="alert alert-danger" role="alert">
-          {{ messages }}
-        </div>
-      {% endif %}
-    </form>
-
-    <h3>Existing Users</h3>
-    {% if users_show %}
-    <ul class="list-group">
-      {% for user in users_show %}
-      <li class="list-group-item d-flex justify-content-between align-items-center">
-        {{ user }}
-        <form method="POST" style="margin:0;">
-          <input type="hidden" name="username" value="{{ user }}">
-          <button type="submit" class="btn btn-danger btn-sm" name="action" value="remove" onclick="return confirm('Remove user {{ user }}? This will also remove their pages!');">
-            <i class="bi bi-trash"></i> Remove
-          </button>
-        </form>
-      </li>
-      {% endfor %}
-    </ul>
-    {% else %}
-    <p>No users found.</p>
-    {% endif %}
-    <a href="{{ url_for('index', space=super_user) }}" class="btn btn-secondary mt-3">
-      <i class="bi bi-arrow-left"></i> Back to Wiki
-    </a>
-    '''
-    body = render_template_string(ADMIN_USERS_BODY, messages=messages, users_show=users_show)
-    return render_template_string(BASE_HTML, title='User Management', body=body,
-                                  current_space=session.get('username'), username=session.get('username'),
-                                  display_username='Super User', all_users=[SUPER_USER]+users_list,
-                                  super_user=SUPER_USER)
+        # Hold the lock across the membership check, mutation and save so concurrent requests can't lose an update
+        with users_lock:
+            if action == 'add':
+                if not username:
+                    messages = 'Enter a username to add.'
+                elif not valid_username(username):
+                    messages = 'Invalid username. Use up to 64 letters, digits, "_", "." or "-", not starting with ".".'
+                elif username == SUPER_USER:
+                    messages = 'Cannot add super user.'
+                elif username in users_list:
+                    messages = 'User already exists.'
+                else:
+                    users_list.add(username)
+                    save_users(users_list)
+                    refresh_user_index()
+                    ensure_user_space(username)
+                    flash(MSG_USER_ADDED % username, 'success')
+                    return manage_users_redirect()
+            elif action == 'remove':
+                if username in users_list:
+                    # Delete user's space directory and contents recursively
+                    user_space_path = user_dir_path(username)
+                    if os.path.isdir(user_space_path):
+                        # Move the space aside right away so the name is free, then delete it off the request thread
+                        removed_path = os.path.join(BASE_DATA_DIR, f'{REMOVED_SPACE_PREFIX}{time.time_ns()}')
+                        os.rename(user_space_path, removed_path)
+                        background_executor.submit(parallel_rmtree, removed_path).add_done_callback(_log_background_failure)
+                    _ensured.discard(username)
+                    _forget_pages(username)
+                    _uncache_user_pages(username)
+                    users_list.remove(username)
+                    save_users(users_list)
+                    refresh_user_index()
+                    flash(MSG_USER_REMOVED % username, 'success')
+                    return manage_users_redirect()
+                else:
+                    messages = f'User "{username}" not found.'
+
+    # Show user list excluding super user, reusing the cached sorted tuple
+    return render(_ADMIN_USERS_TMPL, title='User Management', messages=messages, users_show=get_registered_users(),
+                  current_space=session.get('username'), username=session.get('username'),
+                  display_username='Super User', all_users=get_all_users(),
+                  super_user=SUPER_USER)
 
 # Helper to check permissions in templates (Jinja can't call normal python functions with multiple args directly)
 @app.template_global()
-def user_can_edit(username, page_user):
-    if not username:
-        return False
-    if username == SUPER_USER:
-        return True
-    return username == page_user
+def user_can_edit(username: Optional[str], page_user: str) -> bool:
+    return username is not None and (username == SUPER_USER or username == page_user)
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Serve each request on its own thread so blocking page/image file I/O never stalls other clients
+    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
 
@@ -0,0 +1,62 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const contentDiv = document.querySelector('.content');
+    if (!contentDiv) return;
+
+    const headings = contentDiv.querySelectorAll('h2');
+    headings.forEach(heading => {
+        const toggleBtn = document.createElement('button');
+        toggleBtn.classList.add('toggle-btn');
+        toggleBtn.setAttribute('aria-label', 'Toggle section');
+        toggleBtn.innerHTML = '&#x2212;'; // minus sign, initially expanded
+
+        const wrapper = document.createElement('div');
+        wrapper.classList.add('section-header');
+        while (heading.firstChild) {
+          wrapper.appendChild(heading.firstChild);
+        }
+        heading.textContent = '';
+        heading.appendChild(wrapper);
+        wrapper.appendChild(toggleBtn);
+
+        let sectionContent = [];
+        let sibling = heading.nextElementSibling;
+        while (sibling && sibling.tagName.toLowerCase() !== 'h2') {
+            sectionContent.push(sibling);
+            sibling = sibling.nextElementSibling;
+        }
+
+        toggleBtn.addEventListener('click', () => {
+            const isCollapsed = toggleBtn.innerHTML === '+';
+            if (isCollapsed) {
+                toggleBtn.innerHTML = '&#x2212;';
+                sectionContent.forEach(el => el.style.display = '');
+            } else {
+                toggleBtn.innerHTML = '+';
+                sectionContent.forEach(el => el.style.display = 'none');
+            }
+        });
+    });
+
+    // Navbar minimize toggle
+    const nav = document.querySelector('nav.navbar');
+    const sidebar = document.getElementById('sidebar');
+    const mainContent = document.getElementById('main-content');
+    const btn = document.getElementById('navbarMinimizeBtn');
+    if (nav && sidebar && mainContent && btn) {
+        btn.addEventListener('click', () => {
+            const minimized = nav.classList.toggle('minimized');
+            sidebar.classList.toggle('minimized', minimized);
+            mainContent.classList.toggle('minimized', minimized);
+            // Change icon and aria-expanded attribute
+            if (minimized) {
+                btn.innerHTML = '<i class="bi bi-chevron-down"></i>';
+                btn.setAttribute('aria-expanded', 'false');
+                btn.setAttribute('title', 'Maximize navbar');
+            } else {
+                btn.innerHTML = '<i class="bi bi-chevron-up"></i>';
+                btn.setAttribute('aria-expanded', 'true');
+                btn.setAttribute('title', 'Minimize navbar');
+            }
+        });
+    }
+});